@@ -9,6 +9,12 @@ import yaml
 from .core import DbtMetabase
 from .format import Filter, setup_logging
 
+try:
+    # Prefer libyaml bindings when available
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader  # type: ignore[assignment]
+
 
 def _click_list_option_kwargs() -> Mapping[str, Any]:
     """Click option that accepts comma-separated values.
@@ -66,7 +72,7 @@ def cli(ctx: click.Context, config_path: str):
     config_path_expanded = Path(config_path).expanduser()
     if config_path_expanded.exists():
         with open(config_path_expanded, encoding="utf-8") as f:
-            config = yaml.safe_load(f).get("config", {})
+            config = yaml.load(f, Loader=_YAMLLoader).get("config", {})
             # Propagate common configs to all commands
             common = {k: v for k, v in config.items() if k not in group.commands}
             ctx.default_map = {
@@ -75,10 +75,7 @@ class ModelsMixin(metaclass=ABCMeta):
         self.metabase.sync_database_schema(database["id"])
 
         deadline = int(time.time()) + sync_timeout
-        synced = False
-        while not synced:
-            time.sleep(_SYNC_PERIOD)
-
+        while True:
             tables = self._get_metabase_tables(database["id"])
 
             synced = True
@@ -117,9 +114,12 @@ class ModelsMixin(metaclass=ABCMeta):
 
             ctx.tables = tables
 
-            if int(time.time()) > deadline:
+            # Poll until schema matches, without waiting if it already does
+            if synced or int(time.time()) > deadline:
                 break
 
+            time.sleep(_SYNC_PERIOD)
+
         if not synced and sync_timeout:
             raise MetabaseStateError("Unable to sync models with Metabase")
 
@@ -455,7 +455,7 @@ class ModelsMixin(metaclass=ABCMeta):
             new_table["kind"] = "table"
             new_table["fields"] = fields
 
-            schema_name = table["schema"].upper()
+            schema_name = table["schema"]
             table_name = table["name"].upper()
             tables[f"{schema_name}.{table_name}"] = new_table
 
@@ -5,8 +5,10 @@ import json
 import logging
 import re
 from enum import Enum
+from itertools import chain
 from pathlib import Path
 from typing import (
+    AbstractSet,
     Any,
     Iterable,
     Mapping,
@@ -14,6 +16,7 @@ from typing import (
     MutableSequence,
     Optional,
     Sequence,
+    Tuple,
     Union,
 )
 
@@ -24,23 +27,25 @@ _logger = logging.getLogger(__name__)
 # Namespace for meta fields, e.g. metabase.field
 _META_NS = "metabase"
 # Allowed namespace fields
-_COMMON_META_FIELDS = [
-    "display_name",
-    "visibility_type",
-    "description",
-]
+_COMMON_META_FIELDS = frozenset(
+    [
+        "display_name",
+        "visibility_type",
+        "description",
+    ]
+)
 # Must be covered by Column attributes
-_COLUMN_META_FIELDS = _COMMON_META_FIELDS + [
+_COLUMN_META_FIELDS = _COMMON_META_FIELDS | {
     "semantic_type",
     "has_field_values",
-    "coercion_strate`gy",
+    "coercion_strategy",
     "number_style",
-]
+}
 # Must be covered by Model attributes
-_MODEL_META_FIELDS = _COMMON_META_FIELDS + [
+_MODEL_META_FIELDS = _COMMON_META_FIELDS | {
     "points_of_interest",
     "caveats",
-]
+}
 
 # Default values for non-standard sources
 DEFAULT_DATABASE = ""
@@ -69,44 +74,68 @@ class Manifest:
             Sequence[Model]: List of dbt models in Metabase-friendly format.
         """
 
-        with open(self.path, "r", encoding="utf-8") as f:
-            manifest = json.load(f)
+        manifest = self._read_manifest()
 
         models: MutableSequence[Model] = []
 
-        for node in manifest["nodes"].values():
-            if node["resource_type"] != "model":
-                continue
-
-            name = node["name"]
-            if node["config"]["materialized"] == "ephemeral":
-                _logger.debug("Skipping ephemeral model '%s'", name)
-                continue
+        # (group, source, node) for all models and sources
+        entries: Iterable[Tuple[Group, Optional[str], Mapping]] = chain(
+            (
+                (Group.nodes, None, node)
+                for node in manifest["nodes"].values()
+                if node["resource_type"] == "model"
+            ),
+            (
+                (Group.sources, node["source_name"], node)
+                for node in manifest["sources"].values()
+                if node["resource_type"] == "source"
+            ),
+        )
 
-            models.append(self._read_model(manifest, node, Group.nodes))
+        # Relationship tests are indexed once, rather than scanning children of every model
+        relationship_tests = {
+            group: self._index_relationship_tests(manifest, group) for group in Group
+        }
 
-        for node in manifest["sources"].values():
-            if node["resource_type"] != "source":
+        for group, source, node in entries:
+            if group == Group.nodes and node["config"]["materialized"] == "ephemeral":
+                _logger.debug("Skipping ephemeral model '%s'", node["name"])
                 continue
 
             models.append(
-                self._read_model(manifest, node, Group.sources, node["source_name"])
+                self._read_model(
+                    manifest,
+                    node,
+                    group,
+                    source,
+                    relationship_tests[group].get(node["unique_id"], []),
+                )
             )
 
         return models
 
+    def _read_manifest(self) -> Mapping:
+        """Parses manifest.json file."""
+
+        # Parse raw bytes, skipping text-mode decoding and newline translation
+        with open(self.path, "rb") as f:
+            return json.loads(f.read())
+
     def _read_model(
         self,
         manifest: Mapping,
         manifest_model: Mapping,
         group: Group,
         source: Optional[str] = None,
+        relationship_tests: Iterable[Mapping] = (),
     ) -> Model:
         database = manifest_model["database"]
         schema = manifest_model["schema"]
         unique_id = manifest_model["unique_id"]
 
-        relationships = self._read_relationships(manifest, group, unique_id)
+        relationships = self._read_relationships(
+            manifest, group, unique_id, relationship_tests
+        )
 
         columns = [
             self._read_column(column, schema, relationships.get(column["name"]))
@@ -164,104 +193,117 @@ class Manifest:
 
         return column
 
+    @staticmethod
+    def _index_relationship_tests(
+        manifest: Mapping,
+        group: Group,
+    ) -> Mapping[str, Sequence[Mapping]]:
+        """Indexes relationship tests by tested node, in the same order as the manifest child map."""
+
+        index: MutableMapping[str, MutableSequence[Mapping]] = {}
+
+        for test_id in sorted(manifest.get(group, {})):
+            test = manifest[group][test_id]
+            if (
+                test.get("resource_type") == "test"
+                and test.get("test_metadata", {}).get("name") == "relationships"
+            ):
+                for parent_id in test["depends_on"][group]:
+                    index.setdefault(parent_id, []).append(test)
+
+        return index
+
     def _read_relationships(
         self,
         manifest: Mapping,
         group: Group,
         unique_id: str,
+        tests: Iterable[Mapping],
     ) -> Mapping[str, Mapping[str, str]]:
         relationships = {}
 
-        for child_id in manifest["child_map"][unique_id]:
-            child = manifest.get(group, {}).get(child_id, {})
+        for child in tests:
             child_name = child.get("alias", child.get("name"))
 
-            if (
-                child.get("resource_type") == "test"
-                and child.get("test_metadata", {}).get("name") == "relationships"
-            ):
-                # To get the name of the foreign table, we could use child[test_metadata][kwargs][to], which
-                # would return the ref() written in the test, but if the model has an alias, that's not enough.
-                # Using child[depends_on][nodes] and excluding the current model is better.
-
-                # Nodes contain at most two tables: referenced model and current model (optional).
-                depends_on_nodes = list(child["depends_on"][group])
-
-                # Relationships on disabled models mention them in refs but not depends_on,
-                # which confuses the filtering logic that follows.
-                depends_on_names = {n.split(".")[-1] for n in depends_on_nodes}
-                mismatched_refs = []
-                for ref in child["refs"]:
-                    ref_name = ""
-                    if isinstance(ref, dict):  # current manifest
-                        ref_name = ref["name"]
-                    elif isinstance(ref, list):  # old manifest
-                        ref_name = ref[0]
-                    if ref_name not in depends_on_names:
-                        mismatched_refs.append(ref_name)
-
-                if mismatched_refs:
-                    _logger.debug(
-                        "Mismatched refs %s with depends_on for relationship '%s', skipping",
-                        mismatched_refs,
-                        child_name,
-                    )
-                    continue
+            # To get the name of the foreign table, we could use child[test_metadata][kwargs][to], which
+            # would return the ref() written in the test, but if the model has an alias, that's not enough.
+            # Using child[depends_on][nodes] and excluding the current model is better.
+
+            # Nodes contain at most two tables: referenced model and current model (optional).
+            depends_on_nodes = child["depends_on"][group]
+
+            # Relationships on disabled models mention them in refs but not depends_on,
+            # which confuses the filtering logic that follows.
+            depends_on_names = {n.split(".")[-1] for n in depends_on_nodes}
+            mismatched_refs = []
+            for ref in child["refs"]:
+                ref_name = ""
+                if isinstance(ref, dict):  # current manifest
+                    ref_name = ref["name"]
+                elif isinstance(ref, list):  # old manifest
+                    ref_name = ref[0]
+                if ref_name not in depends_on_names:
+                    mismatched_refs.append(ref_name)
+
+            if mismatched_refs:
+                _logger.debug(
+                    "Mismatched refs %s with depends_on for relationship '%s', skipping",
+                    mismatched_refs,
+                    child_name,
+                )
+                continue
 
-                if len(depends_on_nodes) > 2:
-                    _logger.warning(
-                        "Unexpected %d depends_on for relationship '%s' instead of <=2, skipping",
-                        len(depends_on_nodes),
-                        child_name,
-                    )
-                    continue
-
-                # Skip the incoming relationship tests, in which the fk_target_table is the model currently being read.
-                # Otherwise, the primary key of the current model would be (incorrectly) determined to be FK.
-                if len(depends_on_nodes) == 2 and depends_on_nodes[1] != unique_id:
-                    _logger.debug(
-                        "Circular dependency '%s' for relationship '%s', skipping",
-                        depends_on_nodes[1],
-                        child_name,
-                    )
-                    continue
+            if len(depends_on_nodes) > 2:
+                _logger.warning(
+                    "Unexpected %d depends_on for relationship '%s' instead of <=2, skipping",
+                    len(depends_on_nodes),
+                    child_name,
+                )
+                continue
 
-                # Remove the current model from the list, ensuring it works for self-referencing models.
-                if len(depends_on_nodes) == 2 and unique_id in depends_on_nodes:
-                    depends_on_nodes.remove(unique_id)
+            # Skip the incoming relationship tests, in which the fk_target_table is the model currently being read.
+            # Otherwise, the primary key of the current model would be (incorrectly) determined to be FK.
+            if len(depends_on_nodes) == 2 and depends_on_nodes[1] != unique_id:
+                _logger.debug(
+                    "Circular dependency '%s' for relationship '%s', skipping",
+                    depends_on_nodes[1],
+                    child_name,
+                )
+                continue
 
-                if len(depends_on_nodes) != 1:
-                    _logger.warning(
-                        "Got %d dependencies for '%s' instead of 1, skipping",
-                        len(depends_on_nodes),
-                        unique_id,
-                    )
-                    continue
-
-                depends_on_id = depends_on_nodes[0]
-                depends_on_group = Group.from_unique_id(depends_on_id)
-                if not depends_on_group:
-                    _logger.debug("Unknown group dependency '%s'", depends_on_id)
-                    continue
-
-                fk_target_model = manifest[depends_on_group].get(depends_on_id, {})
-                fk_target_table = (
-                    fk_target_model.get("alias")
-                    or fk_target_model.get("identifier")
-                    or fk_target_model.get("name")
+            if not depends_on_nodes:
+                _logger.warning(
+                    "Got no dependencies for '%s' instead of 1, skipping",
+                    unique_id,
                 )
-                if not fk_target_table:
-                    _logger.debug("Cannot resolve dependency for '%s'", depends_on_id)
-                    continue
+                continue
+
+            # Current model (if present) is always last after the check above, so the first node is the
+            # referenced one, which also covers self-referencing models without copying the list.
+            depends_on_id = depends_on_nodes[0]
+            depends_on_group = Group.from_unique_id(depends_on_id)
+            if not depends_on_group:
+                _logger.debug("Unknown group dependency '%s'", depends_on_id)
+                continue
 
-                fk_target_schema = fk_target_model.get("schema", DEFAULT_SCHEMA)
-                fk_target_table = f"{fk_target_schema}.{fk_target_table}"
-                fk_target_field = child["test_metadata"]["kwargs"]["field"].strip('"')
+            fk_target_model = manifest[depends_on_group].get(depends_on_id, {})
+            fk_target_table = (
+                fk_target_model.get("alias")
+                or fk_target_model.get("identifier")
+                or fk_target_model.get("name")
+            )
+            if not fk_target_table:
+                _logger.debug("Cannot resolve dependency for '%s'", depends_on_id)
+                continue
 
-                relationships[child["column_name"]] = {
-                    "fk_target_table": fk_target_table,
-                    "fk_target_field": fk_target_field,
-                }
+            fk_target_schema = fk_target_model.get("schema", DEFAULT_SCHEMA)
+            fk_target_table = f"{fk_target_schema}.{fk_target_table}"
+            fk_target_field = child["test_metadata"]["kwargs"]["field"].strip('"')
+
+            relationships[child["column_name"]] = {
+                "fk_target_table": fk_target_table,
+                "fk_target_field": fk_target_field,
+            }
 
         return relationships
 
@@ -330,23 +372,27 @@ class Manifest:
 
     @staticmethod
     def _scan_fields(
-        t: Mapping, fields: Iterable[str], ns: str
+        t: Mapping, fields: AbstractSet[str], ns: str
     ) -> MutableMapping[str, Any]:
-        """Reads meta fields from a schem object.
+        """Reads meta fields from a schema object.
 
         Args:
             t (Mapping): Target to scan for fields.
-            fields (Iterable): List of fields to accept.
+            fields (AbstractSet): Set of fields to accept.
             ns (str): Field namespace (separated by .).
 
         Returns:
             Mapping: Field values.
         """
 
+        prefix = f"{ns}."
         vals = {}
-        for field in fields:
-            if f"{ns}.{field}" in t:
-                value = t[f"{ns}.{field}"]
+        # Scan present keys rather than all accepted fields, meta is usually sparse
+        for key, value in t.items():
+            if not key.startswith(prefix):
+                continue
+            field = key[len(prefix) :]
+            if field in fields:
                 vals[field] = value if value is not None else NullValue
         return vals
 
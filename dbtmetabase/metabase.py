@@ -101,8 +101,9 @@ class Metabase:
 
     def find_database(self, name: str) -> Optional[Mapping]:
         """Finds database by name attribute or returns none."""
+        name = name.upper()
         for api_database in self.get_databases():
-            if api_database["name"].upper() == name.upper():
+            if api_database["name"].upper() == name:
                 return api_database
         return None
 
@@ -1,8 +1,14 @@
 #!/usr/bin/env python
 import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from molot import envarg, envarg_int, evaluate, shell, target
+from molot import envarg, envarg_int, evaluate, target
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_logger = logging.getLogger(__name__)
 
 POSTGRES_HOST = envarg("POSTGRES_HOST")
 POSTGRES_PORT = envarg_int("POSTGRES_PORT")
@@ -17,6 +23,76 @@ MB_PASSWORD = envarg("MB_PASSWORD")
 MB_NAME = envarg("MB_NAME", "dbtmetabase")
 
 MB_API_URL = f"http://{MB_HOST}:{MB_PORT}/api"
+MB_SETUP_URL = f"{MB_API_URL}/setup"
+MB_SESSION_URL = f"{MB_API_URL}/session"
+MB_DATABASE_URL = f"{MB_API_URL}/database"
+MB_COLLECTION_URL = f"{MB_API_URL}/collection"
+
+# Metabase database connection for the sandbox Postgres
+DATABASE_BODY = {
+    "engine": "postgres",
+    "name": POSTGRES_DB,
+    "details": {
+        "host": POSTGRES_HOST,
+        "port": POSTGRES_PORT,
+        "dbname": POSTGRES_DB,
+        "user": POSTGRES_USER,
+        "password": POSTGRES_PASSWORD,
+        "schema-filters-type": "all",
+        "ssl": False,
+        "tunnel-enabled": False,
+        "advanced-options": False,
+    },
+    "is_on_demand": False,
+    "is_full_sync": True,
+    "is_sample": False,
+    "cache_ttl": None,
+    "refingerprint": False,
+    "auto_run_queries": True,
+    "schedules": {},
+}
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTP adapter with default request timeout."""
+
+    def __init__(self, *args, timeout: int, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(
+        self,
+        request,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ):
+        return super().send(
+            request,
+            stream=stream,
+            timeout=self.timeout if timeout is None else timeout,
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+
+
+# Keep-alive connections shared by all Metabase API calls
+SESSION = requests.Session()
+SESSION.mount(
+    "http://",
+    TimeoutHTTPAdapter(
+        timeout=10,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            backoff_jitter=0.5,
+            status_forcelist=(502, 503, 504),
+        ),
+    ),
+)
 
 
 @target(
@@ -29,14 +105,26 @@ def init():
 
 @target(description="run dbt project")
 def dbt_run():
-    shell("dbt seed --profiles-dir .")
-    shell("dbt run --profiles-dir .")
+    # Seeds and models in one invocation (one dbt startup and parse), tests are not needed here
+    subprocess.run(
+        [
+            "dbt",
+            "build",
+            "--exclude-resource-type",
+            "test",
+            "--threads",
+            "4",
+            "--profiles-dir",
+            ".",
+        ],
+        check=True,
+    )
 
 
 @target(description="set up Metabase user and database")
 def metabase_setup():
-    setup_resp = requests.post(
-        url=f"{MB_API_URL}/setup",
+    setup_resp = SESSION.post(
+        url=MB_SETUP_URL,
         json={
             "token": MB_SETUP_TOKEN,
             "user": {
@@ -53,104 +141,82 @@ def metabase_setup():
                 "allow_tracking": "false",
             },
         },
-        timeout=10,
     )
     if setup_resp.status_code == 200:
-        logging.info("Metabase setup successful")
+        _logger.info("Metabase setup successful")
     elif setup_resp.status_code == 403:
-        logging.info("Metabase already set up")
+        _logger.info("Metabase already set up")
     else:
         raise requests.HTTPError(f"Error: {setup_resp.reason}", response=setup_resp)
 
-    session_id = requests.post(
-        url=f"{MB_API_URL}/session",
+    session_id = SESSION.post(
+        url=MB_SESSION_URL,
         json={"username": MB_USER, "password": MB_PASSWORD},
-        timeout=10,
     ).json()["id"]
 
-    headers = {"X-Metabase-Session": session_id}
+    SESSION.headers["X-Metabase-Session"] = session_id
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # Independent lookups, fetched concurrently
+        databases_future = executor.submit(
+            SESSION.get,
+            url=MB_DATABASE_URL,
+        )
+        collections_future = executor.submit(
+            SESSION.get,
+            url=MB_COLLECTION_URL,
+        )
+
+        databases = {
+            (db["name"], db["engine"]): db["id"]
+            for db in databases_future.result().json()["data"]
+        }
+        database_id = databases.get((POSTGRES_DB, "postgres"), "")
+        sample_database_id = databases.get(("Sample Database", "h2"), "")
+
+        archive_futures = []
+
+        if sample_database_id:
+            _logger.info("Archiving Metabase sample database %s", sample_database_id)
+            archive_futures.append(
+                executor.submit(
+                    SESSION.delete,
+                    url=f"{MB_DATABASE_URL}/{sample_database_id}",
+                )
+            )
+
+        collections = collections_future.result().json()
+        for collection in collections:
+            if collection.get("is_sample") and not collection.get("archived"):
+                _logger.info("Deleting Metabase sample collection %s", collection["id"])
+                archive_futures.append(
+                    executor.submit(
+                        SESSION.put,
+                        url=f"{MB_COLLECTION_URL}/{collection['id']}",
+                        json={"archived": True},
+                    )
+                )
+
+        for archive_future in archive_futures:
+            archive_future.result().raise_for_status()
 
-    database_id = ""
-    sample_database_id = ""
-    databases = requests.get(
-        url=f"{MB_API_URL}/database",
-        headers=headers,
-        timeout=10,
-    ).json()["data"]
-    for db in databases:
-        if db["name"] == POSTGRES_DB and db["engine"] == "postgres":
-            database_id = db["id"]
-        elif db["name"] == "Sample Database" and db["engine"] == "h2":
-            sample_database_id = db["id"]
-
-    if sample_database_id:
-        logging.info("Archiving Metabase sample database %s", sample_database_id)
-        requests.delete(
-            url=f"{MB_API_URL}/database/{sample_database_id}",
-            headers=headers,
-            timeout=10,
-        ).raise_for_status()
-
-    collections = requests.get(
-        url=f"{MB_API_URL}/collection",
-        headers=headers,
-        timeout=10,
-    ).json()
-    for collection in collections:
-        if collection.get("is_sample") and not collection.get("archived"):
-            logging.info("Deleting Metabase sample collection %s", collection["id"])
-            requests.put(
-                url=f"{MB_API_URL}/collection/{collection['id']}",
-                headers=headers,
-                json={"archived": True},
-                timeout=10,
-            ).raise_for_status()
-
-    database_body = {
-        "engine": "postgres",
-        "name": POSTGRES_DB,
-        "details": {
-            "host": POSTGRES_HOST,
-            "port": POSTGRES_PORT,
-            "dbname": POSTGRES_DB,
-            "user": POSTGRES_USER,
-            "password": POSTGRES_PASSWORD,
-            "schema-filters-type": "all",
-            "ssl": False,
-            "tunnel-enabled": False,
-            "advanced-options": False,
-        },
-        "is_on_demand": False,
-        "is_full_sync": True,
-        "is_sample": False,
-        "cache_ttl": None,
-        "refingerprint": False,
-        "auto_run_queries": True,
-        "schedules": {},
-    }
     if not database_id:
-        logging.info("Creating Metabase database")
-        database_id = requests.post(
-            url=f"{MB_API_URL}/database",
-            headers=headers,
-            json=database_body,
-            timeout=10,
+        _logger.info("Creating Metabase database")
+        database_id = SESSION.post(
+            url=MB_DATABASE_URL,
+            json=DATABASE_BODY,
         ).json()["id"]
     else:
-        logging.info("Updating Metabase database %s", database_id)
-        requests.put(
-            url=f"{MB_API_URL}/database/{database_id}",
-            headers=headers,
-            json=database_body,
-            timeout=10,
+        _logger.info("Updating Metabase database %s", database_id)
+        SESSION.put(
+            url=f"{MB_DATABASE_URL}/{database_id}",
+            json=DATABASE_BODY,
         ).raise_for_status()
 
-    logging.info("Triggering Metabase database sync")
-    requests.post(
-        url=f"{MB_API_URL}/database/{database_id}/sync_schema",
-        headers=headers,
+    _logger.info("Triggering Metabase database sync")
+    SESSION.post(
+        url=f"{MB_DATABASE_URL}/{database_id}/sync_schema",
         json={},
-        timeout=10,
     ).raise_for_status()
 
 
@@ -1,7 +1,8 @@
+import functools
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional, Sequence, Union
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
 
 import requests
 from dotenv import dotenv_values
@@ -14,7 +15,24 @@ FIXTURES_PATH = Path("tests") / "fixtures"
 TMP_PATH = Path("tests") / "tmp"
 
 RECORD = os.getenv("RECORD", "").lower() == "true"
-SANDBOX_ENV = dotenv_values(Path().parent / "sandbox" / ".env")
+
+# Shared response for missing fixtures, never modified
+_NOT_FOUND_RESPONSE = requests.Response()
+_NOT_FOUND_RESPONSE.status_code = 404
+
+
+@functools.lru_cache(maxsize=1)
+def sandbox_env() -> Mapping[str, Optional[str]]:
+    """Reads sandbox .env on first use."""
+    return dotenv_values(Path().parent / "sandbox" / ".env")
+
+
+@functools.lru_cache(maxsize=None)
+def _read_fixture(path: Path) -> Optional[bytes]:
+    """Reads fixture file once, callers parse it because API responses get mutated."""
+    if not path.exists():
+        return None
+    return path.read_bytes()
 
 
 class MockMetabase(Metabase):
@@ -27,8 +45,8 @@ class MockMetabase(Metabase):
 
         if record:
             api_key = None
-            username = SANDBOX_ENV["MB_USER"]
-            password = SANDBOX_ENV["MB_PASSWORD"]
+            username = sandbox_env()["MB_USER"]
+            password = sandbox_env()["MB_PASSWORD"]
 
         super().__init__(
             url=url,
@@ -51,8 +69,8 @@ class MockMetabase(Metabase):
         **kwargs,
     ) -> Union[Mapping, Sequence]:
         result = {}
-        path_toks = f"{path.lstrip('/')}.json".split("/")
-        json_path = Path.joinpath(FIXTURES_PATH, *path_toks)
+        # pathlib splits on "/" itself, on all platforms
+        json_path = FIXTURES_PATH / f"{path.lstrip('/')}.json"
 
         if self.record:
             is_auth = path == "/api/session"
@@ -65,30 +83,40 @@ class MockMetabase(Metabase):
                         json.dump(result, f, indent=4)
         else:
             if method == "get":
-                if json_path.exists():
-                    with open(json_path, encoding="utf-8") as f:
-                        result = json.load(f)
+                fixture = _read_fixture(json_path)
+                if fixture is not None:
+                    result = json.loads(fixture)
                 else:
-                    response = requests.Response()
-                    response.status_code = 404
-                    raise requests.exceptions.HTTPError(response=response)
+                    raise requests.exceptions.HTTPError(response=_NOT_FOUND_RESPONSE)
 
         return result
 
 
+@functools.lru_cache(maxsize=None)
+def _parse_manifest_cached(path: Path, mtime_ns: int) -> Mapping:
+    """Parses manifest once per file version, read_models() never mutates it."""
+    return Manifest(path)._read_manifest()
+
+
 class MockManifest(Manifest):
-    _models: Sequence[Model] = []
+    def __init__(self, path: Union[str, Path]):
+        super().__init__(path)
+        self._models: Optional[Tuple[Model, ...]] = None
+        self._models_by_name: Optional[Mapping[str, Model]] = None
+
+    def _read_manifest(self) -> Mapping:
+        return _parse_manifest_cached(self.path, self.path.stat().st_mtime_ns)
 
     def read_models(self) -> Sequence[Model]:
-        if not self._models:
-            self._models = super().read_models()
+        if self._models is None:
+            self._models = tuple(super().read_models())
         return self._models
 
     def find_model(self, model_name: str) -> Optional[Model]:
-        filtered = [m for m in self._models if m.name == model_name]
-        if filtered:
-            return filtered[0]
-        return None
+        if self._models_by_name is None:
+            # First model wins for duplicate names (e.g. model and source)
+            self._models_by_name = {m.name: m for m in reversed(self.read_models())}
+        return self._models_by_name.get(model_name)
 
     def find_column(
         self,
@@ -97,9 +125,8 @@ class MockManifest(Manifest):
     ) -> Optional[Column]:
         model = self.find_model(model_name=model_name)
         if model:
-            filtered = [c for c in model.columns if c.name == column_name]
-            if filtered:
-                return filtered[0]
+            # Not indexed, tests rename columns in place
+            return next((c for c in model.columns if c.name == column_name), None)
         return None
 
 
@@ -107,7 +134,10 @@ class MockDbtMetabase(DbtMetabase):
     def __init__(
         self,
         manifest_path: Path = FIXTURES_PATH / "manifest-v12.json",
-        metabase_url: str = f"http://localhost:{SANDBOX_ENV['MB_PORT']}",
+        metabase_url: Optional[str] = None,
     ):
+        if metabase_url is None:
+            metabase_url = f"http://localhost:{sandbox_env()['MB_PORT']}"
+
         self._manifest = MockManifest(path=manifest_path)
         self._metabase = MockMetabase(url=metabase_url, record=RECORD)
@@ -11,10 +11,11 @@ def fixture_core() -> MockDbtMetabase:
     return c
 
 
-@pytest.fixture(name="metabase")
+@pytest.fixture(name="metabase", scope="session")
 def fixture_metabase() -> MockMetabase:
     return MockMetabase(url="http://localhost")
 
 
-def setup_module():
+@pytest.fixture(name="tmp_dir", scope="session", autouse=True)
+def fixture_tmp_dir():
     TMP_PATH.mkdir(exist_ok=True)
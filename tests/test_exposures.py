@@ -7,8 +7,21 @@ import yaml
 from dbtmetabase._exposures import _Context, _Exposure
 from tests._mocks import FIXTURES_PATH, TMP_PATH, MockDbtMetabase
 
+# Read-only context shared by native query cases
+_NATIVE_CTX = _Context(
+    model_refs={
+        "database.schema.table0": "model0",
+        "database.public.table1": "model1",
+    },
+    database_names={1: "database"},
+    table_names={},
+)
+
 
 def _assert_exposures(expected_path: Path, actual_path: Path):
+    if expected_path.read_bytes() == actual_path.read_bytes():
+        return
+
     with open(expected_path, encoding="utf-8") as f:
         expected = yaml.safe_load(f)
     with open(actual_path, encoding="utf-8") as f:
@@ -97,21 +110,13 @@ def test_extract_exposures_native_depends(
     query: str,
     expected: set,
 ):
-    ctx = _Context(
-        model_refs={
-            "database.schema.table0": "model0",
-            "database.public.table1": "model1",
-        },
-        database_names={1: "database"},
-        table_names={},
-    )
     exposure = _Exposure(
         model="card",
         uid="",
         label="",
     )
     core._exposure_card(
-        ctx=ctx,
+        ctx=_NATIVE_CTX,
         exposure=exposure,
         card={
             "dataset_query": {
@@ -1,6 +1,7 @@
 from operator import attrgetter
 from typing import Sequence
 
+from dbtmetabase.format import NullValue
 from dbtmetabase.manifest import Column, Group, Manifest, Model
 from tests._mocks import FIXTURES_PATH, MockManifest
 
@@ -400,6 +401,24 @@ def test_v2():
     )
 
 
+def test_scan_fields():
+    meta = Manifest._scan_fields(
+        {
+            "metabase.semantic_type": None,
+            "metabase.coercion_strategy": "Coercion/UNIXSeconds->DateTime",
+            "metabase.unknown": "ignored",
+            "other.display_name": "ignored",
+        },
+        fields={"semantic_type", "coercion_strategy", "display_name"},
+        ns="metabase",
+    )
+    assert meta == {
+        "semantic_type": NullValue,
+        "coercion_strategy": "Coercion/UNIXSeconds->DateTime",
+    }
+    assert meta["semantic_type"] is NullValue
+
+
 def _assert_models_equal(
     first: Sequence[Model],
     second: Sequence[Model],
@@ -1,9 +1,28 @@
-from typing import MutableSequence, cast
+from typing import List, MutableSequence, cast
 
+import pytest
+
+import dbtmetabase._models
+from dbtmetabase.errors import MetabaseStateError
 from dbtmetabase.manifest import Column
 from tests._mocks import MockDbtMetabase
 
 
+class _FakeTime:
+    """Clock that advances on sleep instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float):
+        self.sleeps.append(secs)
+        self.now += secs
+
+
 def test_export(core: MockDbtMetabase):
     core.export_models(
         metabase_database="dbtmetabase",
@@ -32,6 +51,45 @@ def test_export_hidden_table(core: MockDbtMetabase):
     )
 
 
+def test_export_synced_without_sleep(
+    core: MockDbtMetabase,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    fake_time = _FakeTime()
+    monkeypatch.setattr(dbtmetabase._models, "time", fake_time)
+
+    core.export_models(
+        metabase_database="dbtmetabase",
+        skip_sources=True,
+        sync_timeout=10,
+    )
+
+    assert fake_time.sleeps == []
+
+
+def test_export_out_of_sync(
+    core: MockDbtMetabase,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    fake_time = _FakeTime()
+    monkeypatch.setattr(dbtmetabase._models, "time", fake_time)
+
+    core._manifest.read_models()
+    model = core._manifest.find_model("customers")
+    assert model is not None
+    model.columns[0].name = "missing_column"
+
+    with pytest.raises(MetabaseStateError):
+        core.export_models(
+            metabase_database="dbtmetabase",
+            skip_sources=True,
+            sync_timeout=3,
+        )
+
+    assert fake_time.sleeps
+    assert all(secs == dbtmetabase._models._SYNC_PERIOD for secs in fake_time.sleeps)
+
+
 def test_build_lookups(core: MockDbtMetabase):
     expected = {
         "PUBLIC.CUSTOMERS": {